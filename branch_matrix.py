@@ -0,0 +1,219 @@
+import os
+import re
+import csv
+import json
+import argparse
+import numpy as np
+
+BRANCH_SUFFIX = '_branch_visit_count.csv'
+
+RUN_COLUMNS = ['Run', 'Tool', 'Program', 'Variant', 'Repetition', 'File']
+
+
+def output_dirs(program):
+    base_dir = f"/TowardImprovingSE/klee_output_folder/{program}"
+    return os.path.join(base_dir, 'branch_visit_count'), os.path.join(base_dir, 'branch_matrix')
+
+
+def describe_csv(file_name, program):
+    stem = file_name[:-len(BRANCH_SUFFIX)]
+    tool, sep, variant = stem.partition(f"_{program}")
+    if not sep or not tool:
+        return None
+
+    rep_match = re.search(r'(_rep\d+)', variant, re.IGNORECASE)
+    rep_suffix = rep_match.group(1) if rep_match else ""
+    variant = variant.replace(rep_suffix, '') if rep_suffix else variant
+
+    return tool, variant, rep_suffix
+
+
+def find_branch_csvs(csv_dir, program):
+    runs = []
+    for file_name in sorted(os.listdir(csv_dir)):
+        if not file_name.endswith(BRANCH_SUFFIX):
+            continue
+        described = describe_csv(file_name, program)
+        if described is None:
+            continue
+        tool, variant, rep_suffix = described
+        runs.append({
+            'Tool': tool,
+            'Program': program,
+            'Variant': variant,
+            'Repetition': rep_suffix,
+            'File': os.path.join(csv_dir, file_name),
+        })
+    return runs
+
+
+def load_branch_visit_count(csv_filename):
+    branch_visit_count = {}
+    with open(csv_filename, 'r', newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 2:
+                continue
+            branch_visit_count[row[0]] = branch_visit_count.get(row[0], 0) + int(row[1])
+    return branch_visit_count
+
+
+def build_branch_matrix(csv_dir, matrix_dir, program):
+    runs = find_branch_csvs(csv_dir, program)
+
+    branch_ids = {}
+    indptr = [0]
+    indices = []
+    data = []
+
+    for run in runs:
+        branch_visit_count = load_branch_visit_count(run['File'])
+        row = sorted(
+            (branch_ids.setdefault(branch, len(branch_ids)), count)
+            for branch, count in branch_visit_count.items()
+            if count > 0
+        )
+        indices.extend(idx for idx, _ in row)
+        data.extend(count for _, count in row)
+        indptr.append(len(indices))
+
+    os.makedirs(matrix_dir, exist_ok=True)
+    np.save(os.path.join(matrix_dir, 'indptr.npy'), np.asarray(indptr, dtype=np.int64))
+    np.save(os.path.join(matrix_dir, 'indices.npy'), np.asarray(indices, dtype=np.int32))
+    np.save(os.path.join(matrix_dir, 'data.npy'), np.asarray(data, dtype=np.int64))
+
+    with open(os.path.join(matrix_dir, 'branches.txt'), 'w') as f:
+        for branch in branch_ids:
+            f.write(branch + '\n')
+
+    with open(os.path.join(matrix_dir, 'runs.csv'), 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=RUN_COLUMNS)
+        writer.writeheader()
+        for i, run in enumerate(runs):
+            writer.writerow(dict(run, Run=i))
+
+    print(f"Indexed {len(runs)} runs x {len(branch_ids)} branches into {matrix_dir}")
+
+
+class BranchMatrix:
+    def __init__(self, matrix_dir):
+        self.indptr = np.load(os.path.join(matrix_dir, 'indptr.npy'), mmap_mode='r')
+        self.indices = np.load(os.path.join(matrix_dir, 'indices.npy'), mmap_mode='r')
+        self.data = np.load(os.path.join(matrix_dir, 'data.npy'), mmap_mode='r')
+
+        with open(os.path.join(matrix_dir, 'branches.txt'), 'r') as f:
+            self.branches = [line.rstrip('\n') for line in f]
+
+        with open(os.path.join(matrix_dir, 'runs.csv'), 'r', newline='') as csvfile:
+            self.runs = list(csv.DictReader(csvfile))
+
+    def run_label(self, run):
+        return f"{run['Tool']}{run['Variant']}"
+
+    def tools(self):
+        return sorted({self.run_label(run) for run in self.runs})
+
+    def row(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def rep_counts(self, tool):
+        counts = np.zeros(len(self.branches), dtype=np.int32)
+        n_runs = 0
+        for i, run in enumerate(self.runs):
+            if self.run_label(run) == tool:
+                counts[self.row(i)] += 1
+                n_runs += 1
+        return counts, n_runs
+
+    def covered(self, tool):
+        counts, _ = self.rep_counts(tool)
+        return counts > 0
+
+    def covered_by_all_reps(self, tool):
+        counts, n_runs = self.rep_counts(tool)
+        if n_runs == 0:
+            return np.zeros(len(self.branches), dtype=bool)
+        return counts == n_runs
+
+    def uniquely_covered(self):
+        covered = {tool: self.covered(tool) for tool in self.tools()}
+        n_tools = np.zeros(len(self.branches), dtype=np.int32)
+        for mask in covered.values():
+            n_tools += mask
+        return {tool: mask & (n_tools == 1) for tool, mask in covered.items()}
+
+    def jaccard(self):
+        covered = {tool: self.covered(tool) for tool in self.tools()}
+        similarity = {}
+        for a, mask_a in covered.items():
+            for b, mask_b in covered.items():
+                union = np.count_nonzero(mask_a | mask_b)
+                inter = np.count_nonzero(mask_a & mask_b)
+                similarity[(a, b)] = inter / union if union else 0.0
+        return similarity
+
+    def branch_names(self, mask):
+        return [self.branches[i] for i in np.flatnonzero(mask)]
+
+
+def write_branch_list(per_tool, matrix, csv_filename):
+    with open(csv_filename, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['Tool', 'Branch Identifier'])
+        for tool, mask in per_tool.items():
+            for branch in matrix.branch_names(mask):
+                writer.writerow([tool, branch])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Index branch_visit_count outputs into a sparse runs x branches matrix and query it.')
+    parser.add_argument('--program', type=str, required=True, help='Program name as used in config.json (e.g. diff).')
+    parser.add_argument('--build', action='store_true', help='(Re)build the matrix from the branch_visit_count CSVs.')
+    parser.add_argument('--query', type=str, choices=['unique', 'jaccard', 'all_reps'], help='Query to run on the matrix.')
+    parser.add_argument('--csv_dir', type=str, default=None, help='Directory with branch_visit_count CSVs.')
+    parser.add_argument('--matrix_dir', type=str, default=None, help='Directory where the matrix is stored.')
+    parser.add_argument('--output', type=str, default=None, help='Optional CSV file for the branch identifiers returned by unique/all_reps.')
+
+    args = parser.parse_args()
+
+    config_path = os.path.join(os.path.dirname(__file__), 'config.json')
+    with open(config_path, 'r') as f:
+        config_data = json.load(f)
+
+    if args.program not in config_data:
+        print(f"Error: Unknown program {args.program}.")
+        exit(1)
+
+    default_csv_dir, default_matrix_dir = output_dirs(args.program)
+    csv_dir = args.csv_dir or default_csv_dir
+    matrix_dir = args.matrix_dir or default_matrix_dir
+
+    if args.build or not os.path.exists(os.path.join(matrix_dir, 'runs.csv')):
+        build_branch_matrix(csv_dir, matrix_dir, args.program)
+
+    if args.query is None:
+        exit(0)
+
+    matrix = BranchMatrix(matrix_dir)
+    tools = matrix.tools()
+
+    if args.query == 'jaccard':
+        similarity = matrix.jaccard()
+        print("Tool," + ",".join(tools))
+        for a in tools:
+            print(a + "," + ",".join(f"{similarity[(a, b)]:.4f}" for b in tools))
+    else:
+        if args.query == 'unique':
+            per_tool = matrix.uniquely_covered()
+        else:
+            per_tool = {tool: matrix.covered_by_all_reps(tool) for tool in tools}
+
+        print("----------------Results--------------------------------------------")
+        for tool, mask in per_tool.items():
+            print(f"{tool}: {int(np.count_nonzero(mask))}")
+        print("-------------------------------------------------------------------")
+
+        if args.output:
+            write_branch_list(per_tool, matrix, args.output)
+            print(f"Branch list written to {args.output}")
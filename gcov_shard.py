@@ -0,0 +1,230 @@
+import os
+import re
+import glob
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess as sp
+from concurrent.futures import ThreadPoolExecutor
+
+_re_gcov_source = re.compile(r"^File '(.*)'$", re.M)
+_re_gcov_header = re.compile(r"\s*-:\s*0:(Graph|Data|Runs):")
+
+# Object directories that gcov has reported a common source file for (e.g. an
+# inline function in a shared header). Kept across calls, so later checkpoints
+# start from the merged shards instead of rediscovering the links.
+_shard_links = {}
+
+
+def _find(directory):
+    while _shard_links.get(directory, directory) != directory:
+        directory = _shard_links[directory]
+    return directory
+
+
+def _union(dir_a, dir_b):
+    root_a, root_b = _find(dir_a), _find(dir_b)
+    if root_a == root_b:
+        return False
+    _shard_links[root_b] = root_a
+    return True
+
+
+def collect_gcov_files(cov_dir, settings):
+    # gcov_walk lists suffixes to pick up in os.walk order, like `find`;
+    # otherwise gcov_files holds shell-style globs relative to cov_dir.
+    paths = []
+    if settings.get('gcov_walk'):
+        suffixes = tuple(settings['gcov_walk'])
+        for root, dirs, files in os.walk(cov_dir):
+            for file in files:
+                if file.endswith(suffixes):
+                    paths.append(os.path.abspath(os.path.join(root, file)))
+    else:
+        for pattern in settings['gcov_files']:
+            for path in sorted(glob.glob(os.path.join(cov_dir, pattern))):
+                paths.append(os.path.abspath(path))
+    return paths
+
+
+def group_gcov_shards(paths):
+    shards = {}
+    for path in paths:
+        shards.setdefault(_find(os.path.dirname(path)), []).append(path)
+    return [tuple(files) for files in shards.values()]
+
+
+def _run_gcov(files, gcov_flags, out_dir):
+    args = [os.path.relpath(path, out_dir) for path in files]
+    result = sp.run(['gcov'] + gcov_flags + args, cwd=out_dir, stdout=sp.PIPE, stderr=sp.PIPE)
+    return result.stdout, result.stderr
+
+
+def run_serial_gcov(cov_dir, settings, cov_file='cov_result', err_file='err'):
+    cov_dir = os.path.abspath(cov_dir)
+    stdout, stderr = _run_gcov(collect_gcov_files(cov_dir, settings), settings['gcov_flags'], cov_dir)
+    with open(os.path.join(cov_dir, cov_file), 'wb') as cov_f, open(os.path.join(cov_dir, err_file), 'wb') as err_f:
+        cov_f.write(stdout)
+        err_f.write(stderr)
+
+
+def run_sharded_gcov(cov_dir, settings, jobs=None, cov_file='cov_result', err_file='err'):
+    # One gcov per object directory, except that directories reporting the same
+    # source file are merged into one shard and rerun: a single gcov call merges
+    # such a source across objects, separate calls would count it per shard.
+    # Each shard runs in a private sibling of cov_dir (same depth) so relative
+    # source paths resolve as they do in cov_dir.
+    cov_dir = os.path.abspath(cov_dir)
+    paths = collect_gcov_files(cov_dir, settings)
+    results = {}
+
+    try:
+        while True:
+            shards = group_gcov_shards(paths)
+            pending = [shard for shard in shards if shard not in results]
+            out_dirs = [tempfile.mkdtemp(prefix='.gcov_shard_', dir=os.path.dirname(cov_dir)) for _ in pending]
+
+            with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+                outputs = executor.map(_run_gcov, pending, [settings['gcov_flags']] * len(pending), out_dirs)
+                for shard, out_dir, (stdout, stderr) in zip(pending, out_dirs, outputs):
+                    results[shard] = (stdout, stderr, out_dir)
+
+            owners = {}
+            linked = False
+            for shard in shards:
+                stdout = results[shard][0].decode('utf-8', errors='ignore')
+                for source in _re_gcov_source.findall(stdout):
+                    owner = owners.setdefault(source, shard)
+                    if owner is not shard:
+                        linked |= _union(os.path.dirname(owner[0]), os.path.dirname(shard[0]))
+            if not linked:
+                break
+
+        with open(os.path.join(cov_dir, cov_file), 'wb') as cov_f, open(os.path.join(cov_dir, err_file), 'wb') as err_f:
+            for shard in shards:
+                cov_f.write(results[shard][0])
+                err_f.write(results[shard][1])
+
+        for shard in shards:
+            out_dir = results[shard][2]
+            for file in sorted(os.listdir(out_dir)):
+                if file.endswith('.gcov'):
+                    os.replace(os.path.join(out_dir, file), os.path.join(cov_dir, file))
+    finally:
+        for _, _, out_dir in results.values():
+            shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def run_gcov(cov_dir, settings, jobs=None):
+    if jobs == 1:
+        run_serial_gcov(cov_dir, settings)
+    else:
+        run_sharded_gcov(cov_dir, settings, jobs)
+
+
+def _taken_totals(cov_file):
+    covered = 0
+    total = 0
+    with open(cov_file, 'r') as f:
+        for line in f:
+            if "Taken at least" in line:
+                data = line.split(':')[1]
+                percent = float(data.split('% of ')[0])
+                branches = float((data.split('% of ')[1]).strip())
+                covered += int(percent * branches / 100)
+                total += branches
+    return covered, int(total)
+
+
+def _collect_gcov_outputs(cov_dir):
+    outputs = {}
+    for file in os.listdir(cov_dir):
+        if file.endswith('.gcov'):
+            with open(os.path.join(cov_dir, file), 'r', errors='ignore') as f:
+                outputs[file] = [line for line in f if not _re_gcov_header.match(line)]
+            os.remove(os.path.join(cov_dir, file))
+    return outputs
+
+
+def compare_serial_and_sharded(cov_dir, settings, jobs=None):
+    run_serial_gcov(cov_dir, settings)
+    serial_totals = _taken_totals(os.path.join(cov_dir, 'cov_result'))
+    serial_outputs = _collect_gcov_outputs(cov_dir)
+
+    run_sharded_gcov(cov_dir, settings, jobs)
+    sharded_totals = _taken_totals(os.path.join(cov_dir, 'cov_result'))
+    sharded_outputs = _collect_gcov_outputs(cov_dir)
+
+    print(f"serial  (covered, total): {serial_totals}")
+    print(f"sharded (covered, total): {sharded_totals}")
+
+    mismatched = sorted(
+        file for file in set(serial_outputs) | set(sharded_outputs)
+        if serial_outputs.get(file) != sharded_outputs.get(file)
+    )
+    for file in mismatched:
+        print(f"mismatch: {file}")
+
+    return serial_totals == sharded_totals and not mismatched
+
+
+_SELF_CHECK_SOURCES = {
+    'lib/common.h': 'static inline int pick(int x) { if (x > 3) return 1; return 0; }\n',
+    'lib/l.c': '#include "common.h"\nint f(int x) { return pick(x) + (x ? 1 : 2); }\n',
+    'lib/sub/k.c': 'int k(int y) { return y > 1 ? 3 : 4; }\n',
+    'src/m.c': (
+        '#include "../lib/common.h"\n'
+        'int f(int); int k(int);\n'
+        'int main(int c, char **v) { return pick(c) + f(c + 5) + k(c); }\n'
+    ),
+}
+
+
+def self_check(jobs=None):
+    # Scratch tree where lib/ and src/ objects share an inline function in
+    # lib/common.h, compiled out of tree like the benchmarks.
+    root = tempfile.mkdtemp(prefix='gcov_shard_check_')
+    try:
+        for name, code in _SELF_CHECK_SOURCES.items():
+            os.makedirs(os.path.join(root, os.path.dirname(name)), exist_ok=True)
+            with open(os.path.join(root, name), 'w') as f:
+                f.write(code)
+
+        objects = []
+        for name in _SELF_CHECK_SOURCES:
+            if name.endswith('.c'):
+                obj_dir = os.path.join(root, 'obj', os.path.dirname(name))
+                os.makedirs(obj_dir, exist_ok=True)
+                source = os.path.relpath(os.path.join(root, name), obj_dir)
+                sp.run(['gcc', '--coverage', '-c', source], cwd=obj_dir, check=True)
+                objects.append(os.path.join(obj_dir, os.path.basename(name)[:-2] + '.o'))
+
+        cov_dir = os.path.join(root, 'obj', 'src')
+        sp.run(['gcc', '--coverage', '-o', 'm'] + objects, cwd=cov_dir, check=True)
+        sp.run(['./m'], cwd=cov_dir)
+
+        settings = {'gcov_files': ['../*/*.gcda', '../*/*/*.gcda'], 'gcov_flags': ['-b']}
+        return compare_serial_and_sharded(cov_dir, settings, jobs)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check that the sharded gcov pass matches a single serial gcov call.')
+    parser.add_argument('--cov_dir', type=str, default=None, help='Directory gcov runs in (default: build a scratch tree with a shared header).')
+    parser.add_argument('--program', type=str, default=None, help='Program in config.json whose gcov settings are used with --cov_dir.')
+    parser.add_argument('--gcov_jobs', type=int, default=None, help='Number of concurrent gcov workers (default: CPU count).')
+
+    args = parser.parse_args()
+
+    if args.cov_dir:
+        config_path = os.path.join(os.path.dirname(__file__), 'config.json')
+        with open(config_path, 'r') as f:
+            config_data = json.load(f)
+        ok = compare_serial_and_sharded(args.cov_dir, config_data[args.program], args.gcov_jobs)
+    else:
+        ok = self_check(args.gcov_jobs)
+
+    print("OK" if ok else "FAILED")
+    exit(0 if ok else 1)
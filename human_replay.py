@@ -3,11 +3,13 @@ import subprocess as sp
 import math
 import pickle
 import json
+from gcov_shard import run_gcov
 
 
 parser = argparse.ArgumentParser(description='Run KLEE replay and calculate coverage for specified programs.')
 parser.add_argument('--testcase_file', type=str, required=True, help='Testcase file input.')
 parser.add_argument('--gcov_num', type=int, required=True, help='Number to replace in the gcov directory path.')
+parser.add_argument('--gcov_jobs', type=int, default=None, help='Number of concurrent gcov workers (default: CPU count, 1 runs a single gcov call).')
 dangerous = re.compile(
     r'\b(rm|chmod|chown|mv|rmdir|unlink)\b|'               
     r'\bsed\b.*?\s+-i(\S*)?\s+.*(\*|\.\/sed|\b[a-zA-Z0-9._-]*sed\b)'  
@@ -124,7 +126,7 @@ def run_testcase(file_name, branch_visit_count, function_data):
     
         gcov_file = "cov_result"
         running = os.getcwd()
-        os.system(cov_cmd)
+        run_gcov(running, settings, args.gcov_jobs)
         print("-------------------------------------------------------------------")
         bc_list.append(cal_coverage(gcov_file))
             
@@ -169,7 +171,6 @@ gcov_dir = settings['gcov_dir'].replace('<gcov_num>', str(gcov_num))
 
 rm_cmd = settings['rm_cmd']
 replay_cmd = settings['replay_cmd']
-cov_cmd = settings['cov_cmd']
 
 
 if program == 'unknown':
@@ -0,0 +1,231 @@
+import os
+import re
+import csv
+import json
+import mmap
+import struct
+import argparse
+from multiprocessing import Pool
+from replay_common import find_ktest_files, describe_src_dir
+
+_re_arg_obj  = re.compile(r"arg(\d+)$")
+_re_file_obj = re.compile(r"([A-Z])-data$")
+
+KTEST_MAGICS = (b"KTEST", b"BOUT\n")
+
+TABLE_COLUMNS = [
+    'Tool', 'Program', 'Variant', 'Repetition', 'Test Index', 'Ktest File',
+    'Ktest Version', 'Num Objects', 'Num Args', 'Arguments',
+    'Num Symbolic Args', 'Symbolic Arguments', 'Stdin Size', 'File Sizes',
+    'Total Object Bytes', 'Ktest Args',
+]
+
+# klee_init_env options that are consumed (with this many values) and never
+# reach the program's argv.
+_INIT_ENV_OPTIONS = {
+    'sym-files': 2,
+    'sym-stdin': 1,
+    'sym-stdout': 0,
+    'save-all-writes': 0,
+    'fd-fail': 0,
+    'max-fail': 1,
+}
+
+
+def _read_u32(buf, offset):
+    return struct.unpack_from('>I', buf, offset)[0], offset + 4
+
+
+def _read_bytes(buf, offset):
+    size, offset = _read_u32(buf, offset)
+    end = offset + size
+    if end > len(buf):
+        raise ValueError(f"truncated object at offset {offset}")
+    return buf[offset:end], end
+
+
+def _decode(data):
+    return data.split(b'\0', 1)[0].decode('utf-8', errors='backslashreplace')
+
+
+def parse_ktest(ktest_path):
+    with open(ktest_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            magic = next((m for m in KTEST_MAGICS if buf[:len(m)] == m), None)
+            if magic is None:
+                raise ValueError(f"{ktest_path} is not a KTEST file")
+            offset = len(magic)
+
+            version, offset = _read_u32(buf, offset)
+
+            num_args, offset = _read_u32(buf, offset)
+            ktest_args = []
+            for _ in range(num_args):
+                data, offset = _read_bytes(buf, offset)
+                ktest_args.append(_decode(data))
+
+            if version >= 2:
+                _, offset = _read_u32(buf, offset)  # symArgvs
+                _, offset = _read_u32(buf, offset)  # symArgvLen
+
+            num_objects, offset = _read_u32(buf, offset)
+            objects = []
+            for _ in range(num_objects):
+                name, offset = _read_bytes(buf, offset)
+                data, offset = _read_bytes(buf, offset)
+                objects.append((_decode(name), bytes(data)))
+
+    return {
+        'version': version,
+        'args': ktest_args,
+        'objects': objects,
+    }
+
+
+def _init_env_option(arg):
+    for prefix in ('--', '-'):
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return None
+
+
+def rebuild_argv(ktest_args, objects):
+    # Mirrors klee_init_env: concrete arguments are kept, each --sym-arg slot
+    # takes the next argNN object and each --sym-args slot takes an n_args
+    # object followed by that many argNN objects.
+    sym_objects = iter([
+        (name, data) for name, data in objects
+        if name == 'n_args' or _re_arg_obj.match(name)
+    ])
+
+    def next_sym_arg():
+        name, data = next(sym_objects, (None, None))
+        if name is None or not _re_arg_obj.match(name):
+            raise ValueError("symbolic argument objects do not match ktest args")
+        return _decode(data)
+
+    argv = ktest_args[:1]
+    k = 1
+    while k < len(ktest_args):
+        option = _init_env_option(ktest_args[k])
+        if option == 'sym-arg':
+            argv.append(next_sym_arg())
+            k += 2
+        elif option == 'sym-args':
+            min_args, max_args = int(ktest_args[k + 1]), int(ktest_args[k + 2])
+            if min_args == max_args:
+                # klee_range() returns a constant without an n_args object.
+                n_args = min_args
+            else:
+                name, data = next(sym_objects, (None, None))
+                if name != 'n_args':
+                    raise ValueError("missing n_args object for --sym-args")
+                n_args = int.from_bytes(data[:4], 'little')
+            argv.extend(next_sym_arg() for _ in range(n_args))
+            k += 4
+        elif option in _INIT_ENV_OPTIONS:
+            k += 1 + _INIT_ENV_OPTIONS[option]
+        else:
+            argv.append(ktest_args[k])
+            k += 1
+    return argv
+
+
+def summarize_ktest(ktest_path):
+    ktest = parse_ktest(ktest_path)
+
+    arguments = []
+    stdin_size = 0
+    file_sizes = {}
+    total_bytes = 0
+
+    for name, data in ktest['objects']:
+        total_bytes += len(data)
+        arg_match = _re_arg_obj.match(name)
+        file_match = _re_file_obj.match(name)
+        if arg_match:
+            arguments.append((int(arg_match.group(1)), _decode(data)))
+        elif name == 'stdin':
+            stdin_size = len(data)
+        elif file_match:
+            file_sizes[file_match.group(1)] = len(data)
+
+    sym_argv = [value for _, value in sorted(arguments)]
+    argv = rebuild_argv(ktest['args'], ktest['objects'])
+
+    return {
+        'Ktest File': ktest_path,
+        'Ktest Version': ktest['version'],
+        'Num Objects': len(ktest['objects']),
+        'Num Args': len(argv),
+        'Arguments': json.dumps(argv),
+        'Num Symbolic Args': len(sym_argv),
+        'Symbolic Arguments': json.dumps(sym_argv),
+        'Stdin Size': stdin_size,
+        'File Sizes': json.dumps(file_sizes, sort_keys=True),
+        'Total Object Bytes': total_bytes,
+        'Ktest Args': json.dumps(ktest['args']),
+    }
+
+
+def _summarize_or_none(ktest_path):
+    try:
+        return summarize_ktest(ktest_path)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Skipping {ktest_path}: {e}")
+        return None
+
+
+def build_ktest_table(src_dirs, programs, jobs=None):
+    jobs_list = []
+    for src_dir in src_dirs:
+        src_info = describe_src_dir(src_dir, programs)
+        labels = {
+            'Tool': src_info['tool'],
+            'Program': src_info['program'],
+            'Variant': f"{src_info['switch']}{src_info['regex']}{src_info['nxargs']}",
+            'Repetition': src_info['rep'],
+        }
+        # Same selection and order as tools_replay.py, so Test Index i
+        # corresponds to its arguments{i}.txt.
+        for i, ktest_path in enumerate(find_ktest_files(src_dir)):
+            jobs_list.append((dict(labels, **{'Test Index': i}), ktest_path))
+
+    with Pool(processes=jobs) as pool:
+        summaries = pool.map(_summarize_or_none, [job[1] for job in jobs_list], chunksize=64)
+
+    rows = []
+    for (labels, _), summary in zip(jobs_list, summaries):
+        if summary is None:
+            continue
+        row = dict(labels)
+        row.update(summary)
+        rows.append(row)
+    return rows
+
+
+def save_ktest_table(rows, table_filename):
+    os.makedirs(os.path.dirname(os.path.abspath(table_filename)), exist_ok=True)
+    with open(table_filename, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=TABLE_COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extract arguments and input sizes from KLEE .ktest files without klee-replay.')
+    parser.add_argument('--src_dir', type=str, nargs='+', required=True, help='One or more directories containing KLEE output (searched recursively).')
+    parser.add_argument('--output', type=str, default='/TowardImprovingSE/klee_output_folder/ktest_table/ktest_table.csv', help='Path of the CSV table to write.')
+    parser.add_argument('--jobs', type=int, default=None, help='Number of worker processes (default: CPU count).')
+
+    args = parser.parse_args()
+
+    config_path = os.path.join(os.path.dirname(__file__), 'config.json')
+    with open(config_path, 'r') as f:
+        config_data = json.load(f)
+
+    rows = build_ktest_table(args.src_dir, config_data, args.jobs)
+    save_ktest_table(rows, args.output)
+
+    print(f"Parsed {len(rows)} ktest files")
+    print(f"Ktest table written to {args.output}")
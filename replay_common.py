@@ -0,0 +1,119 @@
+import os
+import re
+
+
+def find_ktest_files(src_dir):
+    def extract_numbers_homi(file_name):
+        iteration_match = re.search(r'\d+__tc_dirs', file_name)
+        test_match = re.search(r'test(\d+)\.ktest', file_name)
+        if iteration_match and test_match:
+            iteration_number = int(iteration_match.group(0).split('__')[0])
+            test_number = int(test_match.group(1))
+            return (iteration_number, test_number)
+        else:
+            return (float('inf'), float('inf'))
+
+    def extract_numbers_default(file_name):
+        iteration_match = re.search(r'/iteration(\d+)', file_name)
+        test_match = re.search(r'test(\d+)\.ktest', file_name)
+        if iteration_match and test_match:
+            iteration_number = int(iteration_match.group(1))
+            test_number = int(test_match.group(1))
+            return (iteration_number, test_number)
+        else:
+            return (float('inf'), float('inf'))
+
+    def extract_numbers_featmaker(file_name):
+        iteration_match = re.search(r'/iteration-(\d+)', file_name)
+        test_match = re.search(r'test(\d+)\.ktest', file_name)
+        if iteration_match and test_match:
+            iteration_number = int(iteration_match.group(1))
+            test_number = int(test_match.group(1))
+            return (iteration_number, test_number)
+        else:
+            return (float('inf'), float('inf'))
+
+    ktest_files = []
+
+    if 'homi' in src_dir.lower():
+        extract_function = extract_numbers_homi
+    elif 'featmaker' in src_dir.lower() or 'symtuner' in src_dir.lower():
+        extract_function = extract_numbers_featmaker
+    else:
+        extract_function = extract_numbers_default
+
+    if 'featmaker' in src_dir.lower() and 'seeds' not in src_dir.lower():
+        for iteration_dir in os.listdir(src_dir):
+            if re.match(r'iteration-(\d+)', iteration_dir):
+                iteration_path = os.path.join(src_dir, iteration_dir)
+                if os.path.isdir(iteration_path):
+                    for sub_folder in range(20):
+                        sub_folder_path = os.path.join(iteration_path, str(sub_folder))
+                        if os.path.isdir(sub_folder_path):
+                            for file_name in os.listdir(sub_folder_path):
+                                if file_name.endswith('.ktest'):
+                                    ktest_files.append(os.path.join(sub_folder_path, file_name))
+
+    elif 'symtuner' in src_dir.lower():
+        for iteration_dir in os.listdir(src_dir):
+            if re.match(r'iteration-(\d+)', iteration_dir):
+                klee_out_dir = os.path.join(src_dir, iteration_dir)
+                if os.path.isdir(klee_out_dir):
+                    for file_name in os.listdir(klee_out_dir):
+                        if file_name.endswith('.ktest'):
+                            ktest_files.append(os.path.join(klee_out_dir, file_name))
+
+    
+
+    elif 'homi' in src_dir.lower():
+        for item in os.listdir(src_dir):
+            if ('__tc_dirs' in item or 'iteration' in item):
+                klee_out_dir = os.path.join(src_dir, item)
+                if os.path.isdir(klee_out_dir):
+                    for file_name in os.listdir(klee_out_dir):
+                        if file_name.endswith('.ktest'):
+                            ktest_files.append(os.path.join(klee_out_dir, file_name))
+                            
+    else:
+        for iteration_dir in os.listdir(src_dir):
+            if re.match(r'iteration-(\d+)', iteration_dir):
+                klee_out_dir = os.path.join(src_dir, iteration_dir)
+                if os.path.isdir(klee_out_dir):
+                    for file_name in os.listdir(klee_out_dir):
+                        if file_name.endswith('.ktest'):
+                            ktest_files.append(os.path.join(klee_out_dir, file_name))
+
+    return sorted(ktest_files, key=extract_function)
+
+
+def describe_src_dir(src_dir, programs):
+    program = next((key for key in programs if key in src_dir.lower()), 'unknown')
+
+    tool_name = [tool for tool in ['homi', 'featmaker', 'symtuner', 'klee-aaqc'] if tool in src_dir.lower()]
+    tool_suffix = tool_name[0] if tool_name else 'unknown'
+
+    if tool_suffix == 'featmaker' and 'depth' in src_dir.lower():
+        tool_suffix = 'klee'
+
+    nxargs_match = re.search(r'(humanArgs)', src_dir, re.IGNORECASE)
+    nxargs_suffix = f"_{nxargs_match.group(1)}" if nxargs_match else ""
+
+    regex_match = re.search(r'(regex)', src_dir, re.IGNORECASE)
+    regex_suffix = f"_{regex_match.group(1)}" if regex_match else ""
+
+    rep_match = re.search(r'(rep\d+)', src_dir, re.IGNORECASE)
+    rep_suffix = f"_{rep_match.group(1)}" if rep_match else ""
+
+    switch_suffix = ""
+    switch_match = re.search(r'(switch)', src_dir, re.IGNORECASE)
+    if switch_match:
+        switch_suffix = f"_{switch_match.group(1).lower()}"
+
+    return {
+        'program': program,
+        'tool': tool_suffix,
+        'nxargs': nxargs_suffix,
+        'regex': regex_suffix,
+        'rep': rep_suffix,
+        'switch': switch_suffix,
+    }
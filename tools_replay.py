@@ -9,6 +9,8 @@ import sys
 import signal
 from tempfile import NamedTemporaryFile
 import shutil
+from gcov_shard import run_gcov
+from replay_common import find_ktest_files, describe_src_dir
 
 def timeout_handler(signum, frame):
     print("Process exceeded 300 minutes. Exiting.")
@@ -25,6 +27,7 @@ _re_func      = re.compile(r"\s*function\s+\S+\s+called\s+(\d+)")
 parser = argparse.ArgumentParser(description='Run KLEE replay and calculate coverage for specified programs.')
 parser.add_argument('--src_dir', type=str, required=True, help='Path to the source directory containing KLEE output.')
 parser.add_argument('--gcov_num', type=int, required=True, help='Number to replace in the gcov directory path.')
+parser.add_argument('--gcov_jobs', type=int, default=None, help='Number of concurrent gcov workers (default: CPU count, 1 runs a single gcov call).')
 
 args = parser.parse_args()
 
@@ -42,90 +45,6 @@ def count_directories(path):
     except Exception as e:
         return f"An error occurred: {e}"
 
-def find_ktest_files(src_dir):
-    def extract_numbers_homi(file_name):
-        iteration_match = re.search(r'\d+__tc_dirs', file_name)
-        test_match = re.search(r'test(\d+)\.ktest', file_name)
-        if iteration_match and test_match:
-            iteration_number = int(iteration_match.group(0).split('__')[0])
-            test_number = int(test_match.group(1))
-            return (iteration_number, test_number)
-        else:
-            return (float('inf'), float('inf'))
-
-    def extract_numbers_default(file_name):
-        iteration_match = re.search(r'/iteration(\d+)', file_name)
-        test_match = re.search(r'test(\d+)\.ktest', file_name)
-        if iteration_match and test_match:
-            iteration_number = int(iteration_match.group(1))
-            test_number = int(test_match.group(1))
-            return (iteration_number, test_number)
-        else:
-            return (float('inf'), float('inf'))
-
-    def extract_numbers_featmaker(file_name):
-        iteration_match = re.search(r'/iteration-(\d+)', file_name)
-        test_match = re.search(r'test(\d+)\.ktest', file_name)
-        if iteration_match and test_match:
-            iteration_number = int(iteration_match.group(1))
-            test_number = int(test_match.group(1))
-            return (iteration_number, test_number)
-        else:
-            return (float('inf'), float('inf'))
-
-    ktest_files = []
-
-    if 'homi' in src_dir.lower():
-        extract_function = extract_numbers_homi
-    elif 'featmaker' in src_dir.lower() or 'symtuner' in src_dir.lower():
-        extract_function = extract_numbers_featmaker
-    else:
-        extract_function = extract_numbers_default
-
-    if 'featmaker' in src_dir.lower() and 'seeds' not in src_dir.lower():
-        for iteration_dir in os.listdir(src_dir):
-            if re.match(r'iteration-(\d+)', iteration_dir):
-                iteration_path = os.path.join(src_dir, iteration_dir)
-                if os.path.isdir(iteration_path):
-                    for sub_folder in range(20):
-                        sub_folder_path = os.path.join(iteration_path, str(sub_folder))
-                        if os.path.isdir(sub_folder_path):
-                            for file_name in os.listdir(sub_folder_path):
-                                if file_name.endswith('.ktest'):
-                                    ktest_files.append(os.path.join(sub_folder_path, file_name))
-
-    elif 'symtuner' in src_dir.lower():
-        for iteration_dir in os.listdir(src_dir):
-            if re.match(r'iteration-(\d+)', iteration_dir):
-                klee_out_dir = os.path.join(src_dir, iteration_dir)
-                if os.path.isdir(klee_out_dir):
-                    for file_name in os.listdir(klee_out_dir):
-                        if file_name.endswith('.ktest'):
-                            ktest_files.append(os.path.join(klee_out_dir, file_name))
-
-    
-
-    elif 'homi' in src_dir.lower():
-        for item in os.listdir(src_dir):
-            if ('__tc_dirs' in item or 'iteration' in item):
-                klee_out_dir = os.path.join(src_dir, item)
-                if os.path.isdir(klee_out_dir):
-                    for file_name in os.listdir(klee_out_dir):
-                        if file_name.endswith('.ktest'):
-                            ktest_files.append(os.path.join(klee_out_dir, file_name))
-                            
-    else:
-        for iteration_dir in os.listdir(src_dir):
-            if re.match(r'iteration-(\d+)', iteration_dir):
-                klee_out_dir = os.path.join(src_dir, iteration_dir)
-                if os.path.isdir(klee_out_dir):
-                    for file_name in os.listdir(klee_out_dir):
-                        if file_name.endswith('.ktest'):
-                            ktest_files.append(os.path.join(klee_out_dir, file_name))
-
-    return sorted(ktest_files, key=extract_function)
-
-
 def count_switches_with_nonzero_branch(gcov_path):
     switch_re = re.compile(r'\d+:\s+\d+:\s+.*\bswitch\b')
     branch_re = re.compile(r'branch\s+\d+\s+taken\s+(\d+)%')
@@ -269,36 +188,23 @@ def cal_coverage(cov_file):
 src_dir = args.src_dir
 gcov_num = args.gcov_num
 
-program = next((key for key in config_data if key in src_dir.lower()), 'unknown')
+src_info = describe_src_dir(src_dir, config_data)
+program = src_info['program']
 
 if program == 'unknown':
     print("Error: Program name could not be determined from src_dir.")
     exit(1)
 
-tool_name = [tool for tool in ['homi', 'featmaker', 'symtuner', 'klee-aaqc'] if tool in src_dir.lower()]
-tool_suffix = tool_name[0] if tool_name else 'unknown'
-
-if tool_suffix == 'featmaker' and 'depth' in src_dir.lower():
-    tool_suffix = 'klee'
+tool_suffix = src_info['tool']
 
 switch_counts = []
 
 lower_src = src_dir.lower()
 
-nxargs_match = re.search(r'(humanArgs)', src_dir, re.IGNORECASE)
-nxargs_suffix = f"_{nxargs_match.group(1)}" if nxargs_match else ""
-
-regex_match = re.search(r'(regex)', src_dir, re.IGNORECASE)
-regex_suffix = f"_{regex_match.group(1)}" if regex_match else ""
-
-rep_match = re.search(r'(rep\d+)', src_dir, re.IGNORECASE)
-rep_suffix = f"_{rep_match.group(1)}" if rep_match else ""
-
-
-switch_suffix = ""
-switch_match = re.search(r'(switch)', src_dir, re.IGNORECASE)
-if switch_match:
-    switch_suffix = f"_{switch_match.group(1).lower()}"
+nxargs_suffix = src_info['nxargs']
+regex_suffix = src_info['regex']
+rep_suffix = src_info['rep']
+switch_suffix = src_info['switch']
 
 
 
@@ -307,7 +213,6 @@ settings = config_data[program]
 gcov_dir = settings['gcov_dir'].replace('<gcov_num>', str(gcov_num))
 rm_cmd = settings['rm_cmd']
 replay_cmd = settings['replay_cmd']
-cov_cmd = settings['cov_cmd']
 
 
 arguments_dir = (
@@ -360,8 +265,8 @@ for i, file_path in enumerate(ktest_files_list):
     os.system(cmd)
     if program =='sed':
         os.chdir(os.path.dirname(gcov_dir))
-        
-    os.system(cov_cmd)
+
+    run_gcov(os.getcwd(), settings, args.gcov_jobs)
 
     if i == 0:
         start_time = os.path.getctime(file_path)